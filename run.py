@@ -1,16 +1,44 @@
 # DABUNA – חדשות + מדד + Miniapp (stable)
 from __future__ import annotations
-import os, re, csv, json, time, html, datetime
-from urllib.parse import urlparse, parse_qs, urlunparse, quote_plus
+import os, re, csv, json, math, time, html, random, hashlib, datetime, functools, threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse, parse_qsl, urlencode, urlunparse, quote_plus
 from zoneinfo import ZoneInfo
 import requests, yaml, feedparser
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib3.exceptions import NewConnectionError
 from bs4 import BeautifulSoup
+try:
+    import lxml.html, lxml.etree  # parser מהיר (C); בלעדיו — BeautifulSoup עם html.parser
+    BS_PARSER = "lxml"
+except ImportError:
+    lxml = None
+    BS_PARSER = "html.parser"
+try:
+    import orjson  # JSON מהיר (C); בלעדיו — json של ה-stdlib
+except ImportError:
+    orjson = None
+try:
+    import ahocorasick  # pyahocorasick — התאמת כל ה-aliases במעבר אחד על הטקסט
+except ImportError:
+    ahocorasick = None
+# loader של libyaml (C) כשזמין; אחרת SafeLoader הרגיל — אותה סמנטיקה של safe_load
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
 UA = "DabunaBot/1.1 (+https://t.me/DabunaNews)"
 
 # ---------- Utils ----------
+_TZ = ZoneInfo("Asia/Jerusalem")  # נבנה פעם אחת לתהליך
+
 def now_il() -> datetime.datetime:
-    return datetime.datetime.now(ZoneInfo("Asia/Jerusalem"))
+    return datetime.datetime.now(_TZ)
+
+def is_fresh(iso_date: str | None, hours: float) -> bool:
+    try:
+        return now_il() - datetime.datetime.fromisoformat(iso_date) < datetime.timedelta(hours=hours)
+    except Exception:
+        return False
 
 def safe(s: str) -> str:
     return html.escape(s or "", quote=False)
@@ -18,26 +46,119 @@ def safe(s: str) -> str:
 def ensure_dir(p: str):
     if p and p != ".": os.makedirs(p, exist_ok=True)
 
+def json_dumps(data) -> bytes:
+    return orjson.dumps(data) if orjson else json.dumps(data).encode("utf-8")
+
 def read_json(path: str, default):
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(path, "rb") as f:
+            raw = f.read()
+        return orjson.loads(raw) if orjson else json.loads(raw)
     except Exception:
         return default
 
-def write_json(path: str, data):
+def write_json(path: str, data, compact: bool = False):
     ensure_dir(os.path.dirname(path) or ".")
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    tmp = path + ".tmp"  # כתיבה אטומית — קריסה באמצע לא משאירה JSON חתוך
+    if orjson:
+        opt = orjson.OPT_NON_STR_KEYS | (0 if compact else orjson.OPT_INDENT_2)
+        with open(tmp, "wb") as f: f.write(orjson.dumps(data, option=opt))
+    else:
+        with open(tmp, "w", encoding="utf-8") as f:
+            if compact: json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            else: json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
 
 def load_cfg():
     with open("config.yaml", "r", encoding="utf-8") as f:
-        return yaml.safe_load(f) or {}
+        return yaml.load(f, Loader=YAML_LOADER) or {}
+
+HEBREW = re.compile(r"[\u0590-\u05FF]")
 
 def is_hebrew(text: str) -> bool:
-    return bool(re.search(r"[\u0590-\u05FF]", text or ""))
+    return bool(HEBREW.search(text or ""))
+
+# ---------- HTTP session ----------
+# session אחד לכל הריצה: keep-alive ו-pool לכל host (feeds, כתבות, תרגום, טלגרם).
+# Retry של urllib3: סטטוסים (502-504) רק במתודות idempotent, אבל כשל התחברות — גם ב-POST.
+_SESSION = requests.Session()
+_SESSION.headers.update({"User-Agent": UA})
+_adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64,
+                       max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504]))
+_SESSION.mount("http://", _adapter); _SESSION.mount("https://", _adapter)
+# טלגרם בלי Retry של urllib3 — _tg_call מנהל את הניסיונות לבד (אחרת כל ניסיון שלו הוא 4 התחברויות)
+_SESSION.mount("https://api.telegram.org", HTTPAdapter(max_retries=0))
 
 # ---------- Telegram ----------
+class _RateLimiter:
+    """קצב שליחה (AIMD): acquire() ממתין לתור הבא; 429 חוצה את הקצב, הצלחה מחזירה אותו בהדרגה"""
+    def __init__(self, rate: float):
+        self.base = self.rate = rate; self.next = 0.0; self.lock = threading.Lock()
+
+    def set_rate(self, rate: float):
+        with self.lock: self.base = self.rate = max(rate, 1 / 600)
+
+    def acquire(self):
+        with self.lock:
+            now = time.monotonic(); wait = self.next - now
+            self.next = max(now, self.next) + 1 / self.rate
+        if wait > 0: time.sleep(wait)
+
+    def ok(self):
+        with self.lock: self.rate = min(self.base, self.rate + self.base / 10)
+
+    def throttled(self):
+        with self.lock: self.rate = max(self.rate / 2, 1 / 600)
+
+TG_MAX_ATTEMPTS = 5
+TG_TEXT_LIMIT = 4096  # מגבלת טלגרם נמדדת ביחידות UTF-16, לא בתווים
+_TG_RATE = _RateLimiter(1.0)  # ~1 הודעה/שנייה לצ'אט; post_news_items מכוון לפי publish.rate_per_sec
+
+def _connect_failed(ex: Exception) -> bool:
+    # רק כשל בשלב ההתחברות (timeout/DNS/refused) — הבקשה בוודאות לא נשלחה
+    if isinstance(ex, requests.exceptions.ConnectTimeout): return True
+    reason = getattr(ex.args[0], "reason", None) if ex.args else None
+    return isinstance(reason, NewConnectionError)
+
+def _tg_call(token, method, payload):
+    """
+    קריאה אחת ל-Bot API. 429 — ממתין retry_after; כשל התחברות/502-504 — backoff מעריכי
+    עם jitter. עד TG_MAX_ATTEMPTS ניסיונות. שגיאה אחרי שהבקשה יצאה (ReadTimeout,
+    Connection aborted) לא חוזרת — ההודעה אולי כבר פורסמה בערוץ.
+    502-504 כן חוזרים, ובמקרה נדיר (gateway שנפל אחרי המסירה) זה עלול לשכפל הודעה.
+    """
+    body = json_dumps(payload)
+    for attempt in range(TG_MAX_ATTEMPTS):
+        last_try = attempt == TG_MAX_ATTEMPTS - 1
+        _TG_RATE.acquire()
+        try:
+            r = _SESSION.post(
+                f"https://api.telegram.org/bot{token}/{method}",
+                headers={"Content-Type": "application/json"}, data=body, timeout=30,
+            )
+        except requests.exceptions.ConnectionError as ex:
+            if last_try or not _connect_failed(ex): raise
+            print(f"Telegram {method} attempt {attempt + 1} failed: {ex}")
+            time.sleep(min(60, 2 ** attempt + random.random())); continue
+        if r.status_code in (502, 503, 504) and not last_try:
+            print(f"Telegram {method} attempt {attempt + 1}: HTTP {r.status_code}")
+            time.sleep(min(60, 2 ** attempt + random.random())); continue
+        if r.status_code != 429:
+            if r.ok: _TG_RATE.ok()
+            break
+        _TG_RATE.throttled()
+        if last_try: break  # אין ניסיון נוסף — לא לחכות retry_after לפני ה-RuntimeError
+        retry = 30
+        try: retry = int(r.json().get("parameters", {}).get("retry_after", retry))
+        except Exception: pass
+        time.sleep(retry + 1)
+    if not r.ok:
+        raise RuntimeError(f"Telegram API error: {r.status_code} {r.text}")
+    return r.json()
+
+def _u16len(s: str) -> int:
+    return len(s.encode("utf-16-le")) // 2
+
 def tg_send(token, chat_id, html_text, buttons=None):
     """
     שולח HTML לטלגרם עם חיתוך ו-429 backoff.
@@ -47,85 +168,107 @@ def tg_send(token, chat_id, html_text, buttons=None):
         print("[DRY_RUN] tg_send skipped (len=%d)" % len(html_text or ""))
         return {"ok": True, "dry_run": True}
 
-    CHUNK_LIMIT = 3900
     base_payload = {"chat_id": chat_id, "parse_mode": "HTML", "disable_web_page_preview": False}
 
     txt = html_text or ""
-    parts = []
-    while len(txt) > CHUNK_LIMIT:
-        cut = txt.rfind("\n", 0, CHUNK_LIMIT)
-        if cut < CHUNK_LIMIT // 2: cut = CHUNK_LIMIT
-        parts.append(txt[:cut]); txt = txt[cut:]
-    parts.append(txt)
+    parts, i = [], 0
+    # הליכה באינדקס (בלי להעתיק את השארית בכל חיתוך); כל תו >= יחידת UTF-16 אחת,
+    # לכן מספיק למדוד עד TG_TEXT_LIMIT+1 תווים קדימה
+    while _u16len(txt[i:i + TG_TEXT_LIMIT + 1]) > TG_TEXT_LIMIT:
+        lo, hi = 0, TG_TEXT_LIMIT  # binary search: הרישא הארוכה ביותר שנכנסת ב-4096 יחידות UTF-16
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if _u16len(txt[i:i + mid]) <= TG_TEXT_LIMIT: lo = mid
+            else: hi = mid - 1
+        cut = txt.rfind("\n", i, i + lo)
+        if cut < i + lo // 2: cut = i + lo
+        parts.append(txt[i:cut]); i = cut
+    parts.append(txt[i:])
 
     last = None
     for i, part in enumerate(parts):
         payload = dict(base_payload); payload["text"] = part
         if buttons and i == len(parts)-1:
             payload["reply_markup"] = {"inline_keyboard": buttons}
-        while True:
-            r = requests.post(
-                f"https://api.telegram.org/bot{token}/sendMessage",
-                headers={"Content-Type": "application/json"},
-                data=json.dumps(payload), timeout=30,
-            )
-            if r.status_code == 429:
-                retry = 30
-                try: retry = int(r.json().get("parameters", {}).get("retry_after", retry))
-                except Exception: pass
-                time.sleep(retry + 1)
-                continue
-            if not r.ok:
-                raise RuntimeError(f"Telegram API error: {r.status_code} {r.text}")
-            last = r.json(); break
+        last = _tg_call(token, "sendMessage", payload)
     return last
 
 # ---------- URL normalize ----------
 SKIP_QS = {"utm_source","utm_medium","utm_campaign","utm_term","utm_content","utm_name","gclid","fbclid","igshid","mc_cid","mc_eid","ref","yclid","soc_src","soc_trk"}
 
+@functools.lru_cache(maxsize=8192)
+def _normalize_split(u: str):
+    """מפרק URL פעם אחת: בלי פרמטרי מעקב/fragment, query ממוין, ערך ראשון לכל מפתח"""
+    p = urlparse(u or "")
+    if not p.query: return p._replace(fragment="")  # המקרה הנפוץ — בלי parse_qsl/urlencode
+    q = {}
+    for k, v in parse_qsl(p.query):
+        if k not in SKIP_QS: q.setdefault(k, v)
+    return p._replace(query=urlencode(sorted(q.items())), fragment="")
+
+@functools.lru_cache(maxsize=8192)
 def normalize_url(u: str) -> str:
     try:
-        p = urlparse(u or "")
-        q = parse_qs(p.query, keep_blank_values=False)
-        q = {k: v for k, v in q.items() if k not in SKIP_QS}
-        query = "&".join(f"{k}={v[0]}" for k, v in sorted(q.items()) if v)
-        p2 = p._replace(query=query, fragment="")
-        out = urlunparse(p2)
+        out = urlunparse(_normalize_split(u))
         return out[:-1] if out.endswith("/") else out
     except Exception:
         return u or ""
 
+@functools.lru_cache(maxsize=8192)
 def url_key(u: str) -> str:
     try:
-        n = normalize_url(u)
-        p = urlparse(n)
+        p = _normalize_split(u)
         return f"{(p.netloc or '').lower()}{(p.path or '').rstrip('/')}"
     except Exception:
         return u or ""
 
 # ---------- HTTP ----------
-def http_get(url: str, timeout=12):
+def fetch_text(url: str, timeout=12, max_bytes=512 * 1024) -> str:
+    # stream עם תקרת גודל — דפים ענקיים לא יורדים ולא מפוענחים עד הסוף
     try:
-        r = requests.get(url, timeout=timeout, headers={"User-Agent": UA})
-        if r.ok: return r
+        with _SESSION.get(url, timeout=timeout, stream=True) as r:
+            if not r.ok: return ""
+            buf = bytearray()
+            for chunk in r.iter_content(65536):
+                buf += chunk
+                if len(buf) >= max_bytes: break
+            return bytes(buf[:max_bytes]).decode(r.encoding or "utf-8", errors="replace")
     except Exception:
-        pass
-    return None
-
-def fetch_text(url: str, timeout=12) -> str:
-    r = http_get(url, timeout=timeout)
-    return r.text if r is not None else ""
+        return ""
 
 # ---------- Sources / ingest ----------
+_DROP_TAGS = ("script", "style", "noscript")
+
+def _lxml_text(ht: str) -> str:
+    # כמו get_text(" ", strip=True) של BeautifulSoup, בלי לבנות עץ BS4 (~10× מהיר)
+    try: doc = lxml.html.document_fromstring(ht)
+    except lxml.etree.ParserError: return ""  # מסמך ריק
+    drop = (*_DROP_TAGS, lxml.etree.Comment)
+    for el in doc.iter(*drop): el.tail = " " + (el.tail or "")  # שומר הפרדה בין מחרוזות
+    lxml.etree.strip_elements(doc, *drop, with_tail=False)
+    return " ".join(" ".join(doc.itertext()).split())
+
 def clean_html(ht: str) -> str:
-    soup = BeautifulSoup(ht or "", "html.parser")
-    for t in soup(["script", "style", "noscript"]): t.extract()
+    if not ht: return ""
+    if lxml is not None:
+        try: return _lxml_text(ht)
+        except Exception: pass
+    soup = BeautifulSoup(ht or "", BS_PARSER)
+    for t in soup(list(_DROP_TAGS)): t.extract()
     return " ".join((soup.get_text(" ", strip=True) or "").split())
 
+_DROP_RE = re.compile(r"<(script|style|noscript)\b[^>]*>.*?</\1\s*>|<!--.*?-->", re.S | re.I)
+_TAG_RE = re.compile(r"<[^>]+>")
+
+def clean_html_fast(ht: str) -> str:
+    """לתקצירי RSS (קטעים קצרים ונקיים יחסית): regex + unescape במקום parser"""
+    if not ht: return ""
+    return " ".join(html.unescape(_TAG_RE.sub(" ", _DROP_RE.sub(" ", ht))).split())
+
 def load_sources(whitelist_yaml: str):
     try:
         with open(whitelist_yaml, "r", encoding="utf-8") as f:
-            return yaml.safe_load(f) or {}
+            return yaml.load(f, Loader=YAML_LOADER) or {}
     except FileNotFoundError:
         return {"rss": ["https://www.ynet.co.il/Integration/StoryRss2.xml"], "domains_official": ["ynet.co.il"]}
 
@@ -143,63 +286,213 @@ def translate_chain(cfg) -> list[dict]:
 
 def _translate_libre(url: str, text: str) -> str | None:
     try:
-        r = requests.post(url, json={"q": text, "source": "auto", "target": "he", "format": "text"},
-                          timeout=15, headers={"User-Agent": UA})
+        r = _SESSION.post(url, json={"q": text, "source": "auto", "target": "he", "format": "text"}, timeout=15)
         if r.ok: return r.json().get("translatedText")
     except Exception: pass
     return None
 
+MYMEMORY_MAX = 500  # מגבלת q של MyMemory (bytes); מעבר לזה מחזיר שגיאה במקום תרגום
+
+def _clip_sentences(text: str, limit: int) -> str:
+    b = text.encode("utf-8")
+    if len(b) <= limit: return text
+    head = b[:limit].decode("utf-8", "ignore")
+    cut = max(head.rfind(". "), head.rfind("! "), head.rfind("? "))
+    return head[:cut + 1] if cut > 0 else head.rsplit(" ", 1)[0]
+
 def _translate_mymemory(text: str) -> str | None:
     try:
+        text = _clip_sentences(text, MYMEMORY_MAX)
         endpoint = f"https://api.mymemory.translated.net/get?q={quote_plus(text)}&langpair=auto|he"
-        r = requests.get(endpoint, timeout=15, headers={"User-Agent": UA})
+        r = _SESSION.get(endpoint, timeout=15)
         if r.ok: return r.json().get("responseData", {}).get("translatedText")
     except Exception: pass
     return None
 
+# cache תרגומים בין ריצות: sha256(text) → תרגום (כותרות חוזרות בין feeds ובין ימים)
+TR_CACHE_MAX = 5000
+_TR_CACHE: dict[str, str] = {}
+_TR_LOCK = threading.Lock()  # translate_to_he רץ גם מתוך ה-pool של translate_batch
+
+def _tr_key(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def _tr_hit(k: str) -> str | None:
+    # LRU: פגיעה מזיזה את המפתח לסוף, כך ש-save_tr_cache זורק את מה שלא שימש הכי הרבה זמן
+    with _TR_LOCK:
+        v = _TR_CACHE.pop(k, None)
+        if v is not None: _TR_CACHE[k] = v
+        return v
+
+def load_tr_cache(path: str):
+    _TR_CACHE.update(read_json(path, {}))
+
+def save_tr_cache(path: str):
+    keep = list(_TR_CACHE.items())[-TR_CACHE_MAX:]
+    write_json(path, dict(keep), compact=True)
+
+TR_BATCH = 20  # מחרוזות לבקשת libre אחת
+TR_WORKERS = 4
+
+def _translate_libre_batch(url: str, texts: list[str]) -> list[str] | None:
+    try:
+        r = _SESSION.post(url, json={"q": texts, "source": "auto", "target": "he", "format": "text"}, timeout=30)
+        if r.ok:
+            out = r.json().get("translatedText")
+            if isinstance(out, list) and len(out) == len(texts): return out
+    except Exception: pass
+    return None
+
+def translate_batch(cfg, texts: list[str]) -> list[str]:
+    """
+    מתרגם רשימה בבקשה אחת לכל ספק libre (q כרשימה). מה שנכשל — נופל
+    ל-translate_to_he פר-פריט (כולל mymemory). מחזיר רשימה באותו סדר.
+    """
+    out = list(texts); todo = []
+    for i, t in enumerate(texts):
+        if not t or is_hebrew(t): continue
+        hit = _tr_hit(_tr_key(t))
+        if hit is not None: out[i] = hit
+        else: todo.append(i)
+    with ThreadPoolExecutor(max_workers=TR_WORKERS) as ex:  # החבילות (וה-fallback) במקביל
+        for p in translate_chain(cfg):
+            if not todo: break
+            if (p.get("type") or "").lower() != "libre": continue
+            rest, url = [], p.get("url")
+            # חבילות קטנות — בקשה שנכשלה לא מפילה את כולן
+            chunks = [todo[b:b + TR_BATCH] for b in range(0, len(todo), TR_BATCH)]
+            for chunk, res in zip(chunks, ex.map(lambda c: _translate_libre_batch(url, [texts[i] for i in c]), chunks)):
+                if res is None: rest.extend(chunk); continue
+                for i, tr in zip(chunk, res):
+                    if tr and is_hebrew(tr): out[i] = _TR_CACHE[_tr_key(texts[i])] = tr
+                    else: rest.append(i)
+            todo = rest
+        for i, tr in zip(todo, ex.map(lambda i: translate_to_he(cfg, texts[i]), todo)):
+            out[i] = tr
+    return out
+
 def translate_to_he(cfg, text: str) -> str:
     if not text or is_hebrew(text): return text
+    k = _tr_key(text)
+    hit = _tr_hit(k)
+    if hit is not None: return hit
     for p in translate_chain(cfg):
         typ = (p.get("type") or "").lower()
         out = _translate_libre(p.get("url"), text) if typ=="libre" else (_translate_mymemory(text) if typ=="mymemory" else None)
-        if out and is_hebrew(out): return out
-        time.sleep(0.25)
+        if out and is_hebrew(out):
+            _TR_CACHE[k] = out; return out
     return text
 
 # ---------- Ingest ----------
+feedparser.USER_AGENT = UA
+
+FEED_CACHE_VERSION = 2  # 2: summary מנוקה, רק feeds עם ETag/Last-Modified
+
+def _parse_feed(feed_url: str, cached: dict | None = None, max_entries: int = 50) -> dict:
+    """
+    GET מותנה (ETag/Last-Modified) דרך requests, ואז feedparser על ה-bytes בלבד
+    (בלי HTTP פנימי ובלי sanitize/resolve — ה-summary מנוקה כאן ב-clean_html_fast).
+    ב-304 מחזירים את ה-entries מהריצה הקודמת בלי להוריד ובלי לפרסר את ה-XML;
+    גם בשגיאה זמנית (timeout/DNS/503) — כדי לא לאבד את ה-ETag וה-entries השמורים.
+    """
+    cached = cached or {}
+    has_prev = bool(cached.get("entries"))
+    try:
+        headers = {}
+        if has_prev and cached.get("etag"): headers["If-None-Match"] = cached["etag"]
+        if has_prev and cached.get("modified"): headers["If-Modified-Since"] = cached["modified"]
+        r = _SESSION.get(feed_url, headers=headers, timeout=20)
+        if r.status_code == 304 and has_prev:
+            return cached
+        r.raise_for_status()
+        resp_headers = {k.lower(): v for k, v in r.headers.items()}
+        resp_headers["content-location"] = r.url  # base לקישורים יחסיים
+        fp = feedparser.parse(r.content, response_headers=resp_headers,
+                              resolve_relative_uris=False, sanitize_html=False)
+        entries = [{"link": e.get("link") or "", "title": e.get("title") or "",
+                    "summary": clean_html_fast(e.get("summary", ""))} for e in fp.entries[:max_entries]]
+        return {"etag": r.headers.get("ETag"), "modified": r.headers.get("Last-Modified"), "entries": entries}
+    except Exception as ex:
+        print("RSS error:", feed_url, ex)
+        return cached if has_prev else {"entries": []}
+
 def ingest_items(cfg) -> list[dict]:
     wl = (cfg.get("sources") or {}).get("whitelist_file", "data/sources_whitelist.yaml")
     src = load_sources(wl)
     rss_list = src.get("rss", [])
-    items = []
-    for feed_url in rss_list:
-        try:
-            fp = feedparser.parse(feed_url)
-            for e in fp.entries[:50]:
-                url = normalize_url(e.get("link") or "")
-                title = e.get("title") or ""
-                summary = clean_html(e.get("summary", ""))
-                html_page = fetch_text(url)
-                text = clean_html(html_page) if html_page else summary
-                items.append({"url": url, "title": title, "summary": summary, "text": text,
-                              "source": urlparse(url).netloc, "feed": feed_url})
-        except Exception as ex:
-            print("RSS error:", feed_url, ex)
-    print(f"[DABUNA] fetched {len(items)} raw items from {len(rss_list)} feeds")
+    icfg = cfg.get("ingest") or {}
+    feed_workers = max(1, int(icfg.get("feed_workers", 8)))
+    page_workers = max(1, int(icfg.get("page_workers", 16)))
+    fetch_page = functools.partial(fetch_text, max_bytes=int(icfg.get("max_page_bytes", 512 * 1024)))
+    fetch_full = bool(icfg.get("fetch_full_page", False))
+    min_summary = int(icfg.get("min_summary_len", 0))
+    per_host = max(1, int(icfg.get("per_host", 4)))
+    max_entries = max(1, int(icfg.get("max_entries", 50)))
+
+    # I/O-bound: feeds ואז דפי הכתבות במקביל; ex.map שומר על סדר ה-feeds
+    cache_path = os.path.join(cfg.get("storage_dir", "storage"), "feed_cache.json")
+    cache = read_json(cache_path, {})
+    # פורמט ישן (summary גולמי) — מתעלמים ממנו פעם אחת ומורידים הכל מחדש
+    cache = (cache.get("feeds") or {}) if isinstance(cache, dict) and cache.get("v") == FEED_CACHE_VERSION else {}
+    with ThreadPoolExecutor(max_workers=feed_workers) as ex:
+        feeds = list(ex.map(lambda u: _parse_feed(u, cache.get(u), max_entries), rss_list))
+    reused = sum(1 for u, fd in zip(rss_list, feeds) if fd is cache.get(u))
+    # storage/ נכנס ל-git בכל ריצה: compact, ורק feeds שיש להם ETag/Last-Modified (רק הם נהנים מ-304)
+    keep = {u: fd for u, fd in zip(rss_list, feeds) if fd["entries"] and (fd.get("etag") or fd.get("modified"))}
+    write_json(cache_path, {"v": FEED_CACHE_VERSION, "feeds": keep}, compact=True)
+    # כותרת קצרה נפסלת ממילא ב-filter_and_translate (בדיקה ראשונה, בלי תלות בפריטים אחרים) —
+    # אין טעם להוריד לה דף. כתובות חוזרות לא נזרקות כאן (ההחלטה מי נשאר תלויה ב-dedup
+    # שבהמשך), רק חולקות הורדת דף אחת.
+    min_title_len = int((cfg.get("filters") or {}).get("min_title_len", 16))
+    entries = [(feed_url, e, normalize_url(e.get("link") or ""), e.get("summary", ""))
+               for feed_url, fd in zip(rss_list, feeds) for e in fd["entries"]
+               if len((e.get("title") or "").strip()) >= min_title_len]
+
+    # ברירת מחדל: ה-summary מספיק (specificity סופר ספרות/תאריכים) — דף מלא רק ב-opt-in
+    todo = list(dict.fromkeys(url for _, _, url, summary in entries
+                              if url and (fetch_full or len(summary) < min_summary)))
+    # תקרה לכל host — אתר איטי אחד לא תופס את כל ה-workers
+    host_sems, sems_lock = {}, threading.Lock()
+    def fetch_limited(url):
+        host = urlparse(url).netloc
+        with sems_lock:
+            sem = host_sems.get(host)
+            if sem is None: sem = host_sems[host] = threading.Semaphore(per_host)
+        with sem: return fetch_page(url)
+    with ThreadPoolExecutor(max_workers=page_workers) as ex:
+        pages = dict(zip(todo, ex.map(fetch_limited, todo)))
+
+    items, texts = [], {}
+    for feed_url, e, url, summary in entries:
+        title = e.get("title") or ""
+        html_page = pages.get(url)
+        if html_page and url not in texts: texts[url] = clean_html(html_page)
+        text = texts[url] if html_page else summary
+        items.append({"url": url, "title": title, "summary": summary, "text": text,
+                      "source": urlparse(url).netloc, "feed": feed_url})
+    print(f"[DABUNA] fetched {len(items)} raw items from {len(rss_list)} feeds ({reused} from cache)")
     return items
 
 # ---------- Filter / translate / dedupe ----------
-def _tokens(s: str) -> set[str]:
-    s = (s or "").lower()
-    s = re.sub(r"[^a-z\u0590-\u05FF0-9 ]+", " ", s)
-    s = re.sub(r"\s+", " ", s).strip()
-    return set(s.split()) if s else set()
-
-def similar(a: str, b: str) -> float:
-    A, B = _tokens(a), _tokens(b)
+DUP_THRESHOLD = 0.77
+NONWORD = re.compile(r"[^a-z\u0590-\u05FF0-9]+")
+
+@functools.lru_cache(maxsize=4096)
+def _tokens(s: str) -> frozenset[str]:
+    # shingles של 3 תווים אחרי נרמול — עמיד לשגיאות כתיב, תחיליות וסיומות בעברית
+    s = " ".join(NONWORD.split((s or "").lower())).strip()
+    if len(s) < 3: return frozenset([s]) if s else frozenset()
+    return frozenset(s[i:i+3] for i in range(len(s) - 2))
+
+def _jaccard(A: frozenset, B: frozenset) -> float:
     if not A or not B: return 0.0
-    inter = len(A & B); union = len(A | B)
-    return inter / max(1, union)
+    inter = len(A & B)  # |A∪B| = |A|+|B|-|A∩B| — בלי להקצות את האיחוד
+    return inter / (len(A) + len(B) - inter)
+
+def _prefix(toks: frozenset, t: float) -> list[str]:
+    # prefix filtering: אם J(A,B) >= t אז ה-prefix של A ושל B (בסדר גלובלי) חולקים טוקן לפחות
+    n = len(toks)
+    return sorted(toks)[:n - math.ceil(t * n - 1e-9) + 1]
 
 def filter_and_translate(cfg, items: list[dict]) -> list[dict]:
     out = []
@@ -208,7 +501,9 @@ def filter_and_translate(cfg, items: list[dict]) -> list[dict]:
     tcfg = cfg.get("translate", {})
     translate_limit = int(tcfg.get("max_per_run", 12))
     translated = 0
-    seen, kept_titles = set(), []
+    seen, kept_toks, by_prefix, pending = set(), [], {}, []
+    tr_cache_path = os.path.join(cfg.get("storage_dir", "storage"), "translation_cache.json")
+    load_tr_cache(tr_cache_path)
 
     for it in items:
         title = (it.get("title") or "").strip()
@@ -219,67 +514,98 @@ def filter_and_translate(cfg, items: list[dict]) -> list[dict]:
         if len(title) < min_title_len: continue
         k = url_key(url)
         if k in seen: continue
-        if any(similar(prev, title) >= 0.77 for prev in kept_titles): continue
+        toks = _tokens(title)
+        cands = {j for w in _prefix(toks, DUP_THRESHOLD) for j in by_prefix.get(w, ())}
+        lt = len(toks)  # J(A,B) <= min/max של הגדלים — הפרש אורך גדול פוסל בלי חיתוך
+        if any(DUP_THRESHOLD * max(lt, len(kept_toks[j])) <= min(lt, len(kept_toks[j]))
+               and _jaccard(toks, kept_toks[j]) >= DUP_THRESHOLD for j in cands): continue
 
         need_he = (not is_hebrew(title) and not is_hebrew(summary) and not is_hebrew(text))
         if need_he:
             if translated < translate_limit and tcfg.get("enabled", True):
-                title = translate_to_he(cfg, title[:240])
-                summary = translate_to_he(cfg, summary[:600])
-                translated += 1
+                title, summary = title[:240], summary[:600]
+                pending.append(it); translated += 1
             elif require_hebrew:
                 continue
 
         it["title"] = title; it["summary"] = summary
-        out.append(it); seen.add(k); kept_titles.append(title)
-
+        out.append(it); seen.add(k)
+        for w in _prefix(toks, DUP_THRESHOLD): by_prefix.setdefault(w, []).append(len(kept_toks))
+        kept_toks.append(toks)
+
+    # תרגום אחרי הסינון: בקשה אחת (batch) לכל הכותרות+תקצירים במקום 2 לכל פריט
+    if pending:
+        res = translate_batch(cfg, [t for it in pending for t in (it["title"], it["summary"])])
+        for j, it in enumerate(pending):
+            it["title"], it["summary"] = res[2*j], res[2*j + 1]
+        save_tr_cache(tr_cache_path)
     print(f"[DABUNA] kept {len(out)} items (translated {translated})")
     return out
 
 # ---------- Post news ----------
+POSTED_TTL = 30 * 86400  # מפתחות ישנים מ-30 יום נזרקים בטעינה
+POSTED_MAX = 20000
+
+def load_posted(path: str) -> dict[str, int]:
+    now = int(time.time())
+    data = read_json(path, {})
+    keys = (data.get("keys") if isinstance(data, dict) else None) or {}
+    if isinstance(keys, list): keys = dict.fromkeys((k for k in keys if isinstance(k, str)), now)  # פורמט ישן: רשימה
+    if not isinstance(keys, dict): keys = {}
+    # קובץ פגום לא עוצר את כל הפרסום — ערכים שאינם timestamp מספרי נזרקים
+    keys = {k: int(ts) for k, ts in keys.items()
+            if isinstance(ts, (int, float)) and not isinstance(ts, bool) and now - ts < POSTED_TTL}
+    if len(keys) > POSTED_MAX:  # תקרה קשיחה גם בתוך חלון ה-TTL — נשארים החדשים
+        keys = dict(list(keys.items())[-POSTED_MAX:])  # סדר ההכנסה = סדר הזמן, בלי מיון
+    return keys
+
 def post_news_items(cfg, token, items: list[dict]):
     dest = (cfg.get("channels") or {}).get("news", "@DabunaNews")
     web = cfg.get("web") or {}
     storage_dir = cfg.get("storage_dir", "storage")
     ensure_dir(storage_dir)
     posted_path = os.path.join(storage_dir, "posted_urls.json")
-    posted = read_json(posted_path, {"keys": []})
-    keys = set(posted.get("keys", []))
+    keys = load_posted(posted_path)
 
     pub = cfg.get("publish") or {}
     sent = 0
     max_per_run = int(pub.get("max_per_run", 12))
-    sleep_s    = int(pub.get("sleep_seconds", 25))
+    _TG_RATE.set_rate(float(pub.get("rate_per_sec", 1 / 3)))  # במקום sleep קבוע אחרי כל פוסט
     allow_dups = bool(pub.get("allow_duplicates", False))
 
-    for it in items:
-        if sent >= max_per_run: break
-        k = url_key(it["url"])
-        if not allow_dups and k in keys: continue
+    try:
+        for it in items:
+            if sent >= max_per_run: break
+            k = url_key(it["url"])  # lru_cache — כבר חושב ב-filter_and_translate
+            if not allow_dups and k in keys: continue
 
-        title = it["title"] or ""
-        summary = (it["summary"] or it["text"] or "")[:220]
-        source = it["source"]
+            title = it["title"] or ""
+            summary = (it["summary"] or it["text"] or "")[:220]
+            source = it["source"]
 
-        # מחרוזת רב-שורתית → לא יהיו יותר שגיאות ציטוט
-        msg = f"""🗞️ <b>{safe(title)}</b>
+            # מחרוזת רב-שורתית → לא יהיו יותר שגיאות ציטוט
+            msg = f"""🗞️ <b>{safe(title)}</b>
 TL;DR: {safe(summary)}
 
 מקור: {safe(source)}
 🔗 {it['url']}
 #דבונה #חדשות #ישראל #כנסת"""
 
-        buttons = [
-            [{"text": "📊 מדד", "url": web.get("dashboard_url", "")}],
-            [{"text": "🔗 שתפו", "url": web.get("share_url", "")}],
-        ]
-        try:
-            tg_send(token, dest, msg, buttons)
-            sent += 1; keys.add(k)
-            posted["keys"] = list(keys); write_json(posted_path, posted)
-            time.sleep(sleep_s)
-        except Exception as ex:
-            print("post_news_items error:", ex)
+            buttons = [
+                [{"text": "📊 מדד", "url": web.get("dashboard_url", "")}],
+                [{"text": "🔗 שתפו", "url": web.get("share_url", "")}],
+            ]
+            try:
+                tg_send(token, dest, msg, buttons)
+                sent += 1; keys.pop(k, None); keys[k] = int(time.time())  # לסוף — שומר סדר זמן
+                if sent % 20 == 0:  # checkpoint בריצות ארוכות
+                    write_json(posted_path, {"keys": keys}, compact=True)
+            except Exception as ex:
+                print("post_news_items error:", ex)
+    finally:
+        # כתיבה אחת בסוף הריצה במקום אחרי כל שליחה
+        if sent:
+            write_json(posted_path, {"keys": keys}, compact=True)
 
     print(f"[DABUNA] posted {sent} news")
 
@@ -287,26 +613,47 @@ TL;DR: {safe(summary)}
 DIGITS = re.compile(r"\d+")
 DATES  = re.compile(r"(\d{1,2}[./-]\d{1,2}[./-]\d{2,4})")
 
-def load_people(csv_path="data/politicians.csv"):
+@functools.lru_cache(maxsize=4)
+def load_people(csv_path="data/politicians.csv") -> tuple[dict, ...]:
+    # נקרא פעם אחת לתהליך (daily+weekly באותה ריצה); tuple — לא לשנות את התוצאה
     ppl = []
     with open(csv_path, "r", encoding="utf-8") as f:
         for row in csv.DictReader(f):
-            aliases = [a.strip() for a in (row.get("aliases","") or "").split(";") if a.strip()]
-            aliases = [row.get("name","").strip(), *aliases]
+            aliases = tuple(a.strip() for a in (row.get("aliases","") or "").split(";") if a.strip())
             ppl.append({"id": row["id"], "name": row["name"], "party": row["party"],
-                        "role": row["role"], "aliases": aliases})
-    return ppl
+                        "role": row["role"], "aliases": (row.get("name","").strip(), *aliases)})
+    return tuple(ppl)
 
 def specificity(text:str) -> float:
-    words = max(1, len((text or "").split()))
-    nums = len(DIGITS.findall(text or "")) + len(DATES.findall(text or ""))
+    text = text or ""
+    words = text.count(" ") + 1  # הטקסט כבר מנורמל לרווח בודד (clean_html)
+    # שני מעברים בכוונה: DATES סורק בלי תלות בסדרות הספרות (למשל 25-10-12 בתוך 2025-10-12),
+    # ו-alternation אחת לא משחזרת את הספירה הזו
+    nums = sum(1 for _ in DIGITS.finditer(text)) + sum(1 for _ in DATES.finditer(text))
     return 100.0 * nums / (words/100.0)
 
 def mentions(text:str, person:dict) -> bool:
     return any(a and a in (text or "") for a in person["aliases"])
 
-def indep_domains(urls):
-    return len({urlparse(u).netloc.split(":")[0].lower() for u in urls if u})
+def alias_automaton(people):
+    A = ahocorasick.Automaton()
+    for p in people:
+        for a in p["aliases"]:
+            if a: A.add_word(a, A.get(a, ()) + (p["id"],))
+    if not len(A): return None  # trie ריק לא הופך ל-automaton ו-A.iter זורק AttributeError
+    A.make_automaton()
+    return A
+
+@functools.lru_cache(maxsize=4)
+def people_index(csv_path="data/politicians.csv"):
+    """people + מיפוי id→person, סדר ב-CSV ו-automaton של ה-aliases — נבנים פעם אחת לתהליך"""
+    people = load_people(csv_path)
+    by_id = {p["id"]: p for p in people}
+    rank = {p["id"]: i for i, p in enumerate(people)}
+    return people, by_id, rank, (alias_automaton(people) if ahocorasick else None)
+
+def indep_domains(netlocs):
+    return len({n.split(":")[0].lower() for n in netlocs})
 
 def score_transparency(flags):
     if not flags: return 0.0
@@ -314,19 +661,27 @@ def score_transparency(flags):
 
 def score_fact_integrity(group, avg_spec):
     if not group: return 0.0
-    indep = indep_domains([g["url"] for g in group])
+    # source = netloc שחושב כבר ב-ingest — בלי urlparse נוסף לכל פריט
+    indep = indep_domains([g["source"] if "source" in g else urlparse(g["url"]).netloc for g in group if g["url"]])
     base = 50.0 + min(40.0, (indep-1)*15.0)
     bonus = min(15.0, avg_spec/10.0)
     return min(100.0, base + bonus)
 
-def score_consistency(headlines):
-    if not headlines: return 0.0
-    toks = [set((h or "").split()) for h in headlines]
-    inter = set.intersection(*toks) if len(toks)>=2 else toks[0]
+@functools.lru_cache(maxsize=4096)
+def _word_set(s: str) -> frozenset[str]:
+    return frozenset(s.split())  # כותרת שמופיעה אצל כמה אנשים מפוצלת פעם אחת
+
+def score_consistency(token_sets):
+    if not token_sets: return 0.0
+    toks = sorted(token_sets, key=len)
+    inter = toks[0]
+    for t in toks[1:]:  # מהקבוצה הקטנה ביותר, עצירה מוקדמת כשהחיתוך ריק
+        if not inter: break
+        inter = inter & t
     return max(40.0, min(100.0, 60.0 + len(inter)*10.0))
 
 def compute_rows(items: list[dict]) -> list[dict]:
-    people = load_people("data/politicians.csv")
+    people, by_id, rank, A = people_index("data/politicians.csv")
     for it in items:
         it["specificity"] = specificity(it.get("text") or it.get("summary") or "")
         it["is_primary"] = True
@@ -334,17 +689,20 @@ def compute_rows(items: list[dict]) -> list[dict]:
     per = {}
     for it in items:
         txt = (it.get("title") or "") + " " + (it.get("summary") or "")
-        for p in people:
-            if mentions(txt, p):
-                per.setdefault(p["id"], {"person": p, "items": []})
-                per[p["id"]]["items"].append(it)
+        if A is not None:
+            hits = sorted({pid for _, ids in A.iter(txt) for pid in ids}, key=rank.get)
+        else:
+            hits = [p["id"] for p in people if mentions(txt, p)]
+        for pid in hits:
+            per.setdefault(pid, {"person": by_id[pid], "items": []})
+            per[pid]["items"].append(it)
 
     rows = []
     for pid, data in per.items():
         p = data["person"]; group = data["items"]
         avg_spec = sum(it["specificity"] for it in group)/max(1,len(group))
         headlines = [g.get("title","").strip() for g in group][:5]
-        Consistency = score_consistency(headlines)
+        Consistency = score_consistency([_word_set(h) for h in headlines])
         FactIntegrity = score_fact_integrity(group, avg_spec)
         Transparency = score_transparency([g.get("is_primary", False) for g in group])
         Correction = 0.0
@@ -387,8 +745,9 @@ def cmd_daily(cfg, token):
     post_news_items(cfg, token, items)
 
     rows = compute_rows(items)
-    write_json(os.path.join(storage_dir, f"daily_scores_{now_il().date()}.json"), rows)
-    write_json(os.path.join(storage_dir, "latest_scores.json"), {"date": now_il().isoformat(), "rows": rows})
+    t = now_il()
+    write_json(os.path.join(storage_dir, f"daily_scores_{t.date()}.json"), rows)
+    write_json(os.path.join(storage_dir, "latest_scores.json"), {"date": t.isoformat(), "rows": rows})
     print("[DABUNA] daily finished.")
 
 def cmd_weekly(cfg, token):
@@ -396,7 +755,12 @@ def cmd_weekly(cfg, token):
     latest = read_json(os.path.join(storage_dir, "latest_scores.json"), {})
     rows = latest.get("rows") or []
     if not rows:
-        items_all = ingest_items(cfg); items = filter_and_translate(cfg, items_all); rows = compute_rows(items)
+        # snapshot של ה-daily מהיממה האחרונה חוסך ingest + תרגום מלאים
+        snap = read_json(os.path.join(storage_dir, "latest.json"), {})
+        if snap.get("rows") and is_fresh(snap.get("date"), hours=24):
+            rows = compute_rows(snap["rows"])
+        else:
+            items_all = ingest_items(cfg); items = filter_and_translate(cfg, items_all); rows = compute_rows(items)
     post_daily_index(cfg, token, rows); print("[DABUNA] weekly index posted.")
 
 def cmd_miniapp(cfg, token):